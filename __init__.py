@@ -9,6 +9,7 @@ Author:
 
 Exports:
     RemarkableAPI: The main class to interact with the reMarkable tablet's file system.
+    AsyncRemarkableAPI: An asyncio counterpart of RemarkableAPI (requires the optional httpx dependency).
     File: Data model representing individual files on the tablet.
     Directory: Data model representing folders containing files and/or other directories.
 """
@@ -17,6 +18,7 @@ __author__ = "Luca Binotti"
 __version__ = "1.0.0"
 
 from .api import RemarkableAPI
+from .async_api import AsyncRemarkableAPI
 from .models import File, Directory
 
-__all__ = ["RemarkableAPI", "File", "Directory"]
+__all__ = ["RemarkableAPI", "AsyncRemarkableAPI", "File", "Directory"]
@@ -1,11 +1,303 @@
 import os
+import sys
+import json
+import zlib
 import time
-import pickle
-import shutil
 import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from .models import File, Directory
-from typing import List, Union, Callable
+from functools import lru_cache
+from contextlib import contextmanager
+from operator import itemgetter
+from .models import File, Directory, item_from_dict
+from typing import BinaryIO, Dict, Iterator, List, Set, Tuple, Union, Callable
+
+
+@lru_cache(maxsize=10000)
+def _parse_timestamp(value: str) -> datetime:
+    """
+    Parses a ModifiedClient timestamp sent by the tablet, such as "2024-01-31T12:00:00.000Z".
+
+    Results are cached, since most timestamps are unchanged between two syncs of the same tablet.
+
+    Args:
+        value (str): The timestamp to parse.
+
+    Returns:
+        datetime: The corresponding naive datetime.
+    """
+    # fromisoformat is implemented in C and is much faster than strptime or slicing the fields by hand. The timestamp
+    # always ends with "Z", which it rejects before Python 3.11 and which would make the result timezone-aware on 3.11+
+    try:
+        return datetime.fromisoformat(value[:-1])
+    except ValueError:
+        # Before Python 3.11, fromisoformat only accepts exactly 3 or 6 fractional digits
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _read_session(session_path: str) -> List[Union[File, Directory]]:
+    """
+    Reads a directory tree from a session file written by _write_session.
+
+    Uncompressed JSON sessions are still accepted. Session files that cannot be read as JSON (such as the pickle files
+    written by earlier versions) yield an empty tree.
+
+    Args:
+        session_path (str): The path of the session file.
+
+    Returns:
+        List[Union[File, Directory]]: The directory tree stored in the session.
+    """
+    with open(session_path, "rb") as f:
+        data = f.read()
+    try:
+        data = zlib.decompress(data)
+    except zlib.error:
+        pass
+    try:
+        return [item_from_dict(item) for item in json.loads(data)]
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return []
+
+
+def _write_session(session_path: str, tree: List[Union[File, Directory]]):
+    """
+    Writes a directory tree to a session file as zlib-compressed JSON.
+
+    Args:
+        session_path (str): The path of the session file.
+        tree (List[Union[File, Directory]]): The directory tree to store.
+    """
+    data = json.dumps([item.to_dict() for item in tree], ensure_ascii=False, separators=(",", ":"))
+    with open(session_path, "wb") as f:
+        f.write(zlib.compress(data.encode("utf-8")))
+
+
+def _preallocate(file: BinaryIO, content_length: Union[str, None]):
+    """
+    Reserves disk space for a download up front, so that large files are not grown piece by piece and end up fragmented.
+
+    Does nothing when the size is unknown or the platform or file system does not support preallocation.
+
+    Args:
+        file (BinaryIO): The file opened for writing.
+        content_length (Union[str, None]): The Content-Length header of the response, if any.
+    """
+    if content_length and content_length.isdigit() and int(content_length) > 0 and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(file.fileno(), 0, int(content_length))
+        except OSError:
+            pass
+
+
+@contextmanager
+def _part_file(output_file: str, file_guid: str, content_length: Union[str, None]) -> Iterator[BinaryIO]:
+    """
+    Opens a temporary ".part" file next to output_file for a download, and moves it to output_file once complete.
+
+    The file is preallocated to its announced size, and truncated to what was actually written before being moved.
+    If anything fails, including an interruption, the temporary file is removed instead, so an existing copy is never
+    replaced by a partial download. The GUID in its name keeps it distinct from other files downloaded to the same
+    path at the same time.
+
+    Args:
+        output_file (str): The path where the downloaded file will be saved.
+        file_guid (str): The unique identifier (GUID) of the file being downloaded.
+        content_length (Union[str, None]): The Content-Length header of the response, if any.
+
+    Yields:
+        BinaryIO: The temporary file, opened for writing.
+    """
+    part_file = f"{output_file}.{file_guid}.part"
+    try:
+        with open(part_file, "wb") as file:
+            _preallocate(file, content_length)
+            yield file
+            file.truncate()
+        os.replace(part_file, output_file)
+    except BaseException:
+        if os.path.exists(part_file):
+            os.remove(part_file)
+        raise
+
+
+def _build_tree(dir_guid: str, listings: Dict[str, List[dict]], dir_bookmarked: bool = False) -> List[Union[File, Directory]]:
+    """
+    Builds the tree below a directory from the raw listings returned by _fetch_listings.
+
+    Args:
+        dir_guid (str): The unique identifier (GUID) of the directory the tree starts from.
+        listings (Dict[str, List[dict]]): The raw items of each directory, by directory GUID.
+        dir_bookmarked (bool): If True, the directory and all its contents are considered bookmarked.
+
+    Returns:
+        List[Union[File, Directory]]: The File and Directory objects inside the directory, with their children filled in.
+    """
+    root_dir = []
+    stack = [(dir_guid, dir_bookmarked, root_dir)]
+    while stack:
+        guid, bookmarked, children = stack.pop()
+        parsed = _parse_items(listings.get(guid, []), bookmarked)
+        children.extend(parsed)
+        for item in parsed:
+            if isinstance(item, Directory):
+                stack.append((item.guid, item.bookmarked, item.children))
+    return root_dir
+
+
+def _parse_items(items: List[dict], dir_bookmarked: bool = False) -> List[Union[File, Directory]]:
+    """
+    Converts the items of a directory listing returned by the tablet into File and Directory objects.
+
+    Args:
+        items (List[dict]): The raw items as returned by the tablet.
+        dir_bookmarked (bool): If True, the directory containing the items is bookmarked, and so are all the items.
+
+    Returns:
+        List[Union[File, Directory]]: The parsed items, skipping unknown item types. Directories have no children yet.
+    """
+    # Bind everything used in the loop to locals, this runs once per item of the whole tree
+    get_fields = itemgetter("Type", "ID", "VissibleName", "ModifiedClient", "Bookmarked")
+    parse_time = _parse_timestamp
+    make_file = File
+    make_directory = Directory
+    parsed = [None] * len(items)
+    count = 0
+    for item in items:
+        item_type, guid, name, modified, bookmarked = get_fields(item)
+        if item_type == "DocumentType":
+            parsed[count] = make_file(guid, name, parse_time(modified), dir_bookmarked or bookmarked)
+        elif item_type == "CollectionType":
+            parsed[count] = make_directory(guid, name, parse_time(modified), [], dir_bookmarked or bookmarked)
+        else:
+            continue
+        count += 1
+    del parsed[count:]
+    return parsed
+
+
+def _walk_tree(tree: List[Union[File, Directory]], base_path: str, filter_fn: Callable[[Union[File, Directory]], bool] = None) -> Iterator[Tuple[Union[File, Directory], str]]:
+    """
+    Walks a tree depth-first using an explicit stack, lazily yielding the items accepted by a filter function.
+
+    When a directory is accepted, all of its contents are accepted as well without calling the filter function again.
+
+    Args:
+        tree (List[Union[File, Directory]]): The list of File or Directory objects to walk.
+        base_path (str): The local path the top level of the tree maps to.
+        filter_fn (Callable[[Union[File, Directory]], bool], optional): A function that takes a File or Directory object and returns True if the item should be selected.
+
+    Yields:
+        Tuple[Union[File, Directory], str]: Each selected item along with its local path (files get a .pdf extension).
+    """
+    stack = [(item, base_path, filter_fn) for item in reversed(tree)]
+    while stack:
+        item, parent_path, item_filter = stack.pop()
+        selected = item_filter is None or item_filter(item)
+        if isinstance(item, Directory):
+            dir_path = os.path.join(parent_path, item.name)
+            if selected:
+                yield item, dir_path
+            child_filter = None if selected else item_filter
+            stack.extend((child, dir_path, child_filter) for child in reversed(item.children))
+        elif selected:
+            yield item, os.path.join(parent_path, f"{item.name}.pdf")
+
+
+def _download_jobs(tree: List[Union[File, Directory]], base_path: str, filter_fn: Callable[[Union[File, Directory]], bool] = None) -> Tuple[Dict[str, File], Set[str]]:
+    """
+    Lists the files to download from a tree and the local directories they need.
+
+    The tablet allows files with the same name in one directory. Jobs are keyed by output path, so only the last of
+    them is kept, as it is the one that would end up on disk anyway, and two downloads never write the same file.
+
+    Args:
+        tree (List[Union[File, Directory]]): The list of File or Directory objects to download from.
+        base_path (str): The local path the top level of the tree maps to.
+        filter_fn (Callable[[Union[File, Directory]], bool], optional): A function that takes a File or Directory object and returns True if the item should be downloaded.
+
+    Returns:
+        Tuple[Dict[str, File], Set[str]]: The files to download by output path, and the directories to create,
+            including selected directories that are empty.
+    """
+    jobs = {}
+    directories = set()
+    for item, item_path in _walk_tree(tree, base_path, filter_fn):
+        if isinstance(item, File):
+            directories.add(os.path.dirname(item_path))
+            jobs[item_path] = item
+        else:
+            directories.add(item_path)
+    return jobs, directories
+
+
+def _flatten_tree(tree: List[Union[File, Directory]]) -> Dict[Tuple[str, ...], Union[File, Directory]]:
+    """
+    Flattens a tree into a dict mapping the path of every item to the item itself.
+
+    Paths are tuples of names, so that names containing "/" cannot collide with nested items.
+    If several items share a path, the first one in depth-first order is kept.
+
+    Args:
+        tree (List[Union[File, Directory]]): The list of File or Directory objects representing the tree.
+
+    Returns:
+        Dict[Tuple[str, ...], Union[File, Directory]]: Every item of the tree, by path.
+    """
+    index = {}
+    stack = [(item, (item.name,)) for item in reversed(tree)]
+    while stack:
+        item, path = stack.pop()
+        index.setdefault(path, item)
+        if isinstance(item, Directory):
+            stack.extend((child, path + (child.name,)) for child in reversed(item.children))
+    return index
+
+
+def _get_modified_file_guids(old_index: Dict[Tuple[str, ...], Union[File, Directory]], new_tree: List[Union[File, Directory]], modified_files: Set[str], skip_unchanged_directories: bool = False):
+    """
+    Compares two directory trees to find the files that have been modified or added.
+
+    Items are matched by path: the new tree is walked with an explicit stack and every file is looked up
+    in constant time in the path index of the old tree.
+
+    Args:
+        old_index (Dict[Tuple[str, ...], Union[File, Directory]]): The previously saved directory tree, flattened by _flatten_tree.
+        new_tree (List[Union[File, Directory]]): The current directory tree fetched from the tablet.
+        modified_files (Set[str]): A set to add the GUIDs of files that have been modified or added to.
+        skip_unchanged_directories (bool): If True, directories with the same last change as in the old tree are skipped along with their contents.
+    """
+    stack = [(item, (item.name,)) for item in reversed(new_tree)]
+    while stack:
+        new_item, path = stack.pop()
+        if isinstance(new_item, File):
+            matching_old_item = old_index.get(path)
+            if matching_old_item is None or new_item.last_change > matching_old_item.last_change:
+                modified_files.add(new_item.guid)
+        elif isinstance(new_item, Directory):
+            if skip_unchanged_directories:
+                matching_old_item = old_index.get(path)
+                if isinstance(matching_old_item, Directory) and matching_old_item.last_change == new_item.last_change:
+                    continue
+            stack.extend((child, path + (child.name,)) for child in reversed(new_item.children))
+
+
+def _changed_files_filter(modified_files: Set[str], filter_fn: Callable[[Union[File, Directory]], bool] = None) -> Callable[[Union[File, Directory]], bool]:
+    """
+    Builds the filter used by download_changes, restricting filter_fn to the given modified files.
+
+    Args:
+        modified_files (Set[str]): The GUIDs of the files that have been modified or added.
+        filter_fn (Callable[[Union[File, Directory]], bool], optional): An additional filter function the items must pass.
+
+    Returns:
+        Callable[[Union[File, Directory]], bool]: The combined filter function.
+    """
+    if filter_fn is None:
+        return lambda item: item.guid in modified_files
+    return lambda item: item.guid in modified_files and filter_fn(item)
 
 
 class RemarkableAPI:
@@ -19,10 +311,14 @@ class RemarkableAPI:
         session_path (str): Path to the session file for saving/restoring the file tree.
         base_url (str): The base URL of the reMarkable tablet's local API.
         timeout (int): Timeout duration for checking device connectivity.
+        cache_ttl (float): Number of seconds a fetched directory listing is reused before being requested again.
         tree (List[Union[File, Directory]]): The current representation of the file system.
+
+    The HTTP connection to the tablet is kept alive and reused across requests. Call close() when done,
+    or use the instance as a context manager.
     """
 
-    def __init__(self, session_name: str = None, base_url: str = "http://10.11.99.1", timeout: int = 1):
+    def __init__(self, session_name: str = None, base_url: str = "http://10.11.99.1", timeout: int = 1, cache_ttl: float = 5.0):
         """
         Initializes the RemarkableAPI class with basic configurations.
 
@@ -30,38 +326,82 @@ class RemarkableAPI:
             session_name: The name of the session file to load/save.
             base_url: The base URL of the reMarkable tablet's local API.
             timeout: The timeout duration for checking device connectivity.
+            cache_ttl: The number of seconds a directory listing is cached for (0 disables the cache).
 
         If session_name is None, no session is saved, and the state remains in memory only.
         """
         self.session_path = f"{session_name}.session"
         self.base_url = base_url
         self.timeout = timeout
+        self.cache_ttl = cache_ttl
         self.tree: List[Union[File, Directory]] = []
 
+        # Reuse a single keep-alive connection pool for every request to the tablet
+        self._session = requests.Session()
+        # Responses travel over a local USB link, asking the tablet to compress them only costs CPU on both ends
+        self._session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "identity"})
+        # Retry briefly so that transient USB hiccups do not surface as connection errors. The pool is only used for
+        # the tablet and is large enough for the listing and download workers plus the calling thread
+        self._session.mount(self.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.1)))
+        # Connectivity checks get their own session without retries, so that a missing tablet is reported after a single timeout
+        self._probe_session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=8)
+        # The tablet's web server is modest, keep the number of simultaneous downloads low
+        self._download_executor = ThreadPoolExecutor(max_workers=4)
+
+        # Directories created by the current download_tree call, cleared at the start of each call so that
+        # folders deleted in the meantime are created again
+        self._mkdir_cache: Set[str] = set()
+
+        # Raw directory listings by GUID, along with the time they were fetched and their Last-Modified header
+        self._dir_cache: Dict[str, Tuple[float, Union[str, None], List[dict]]] = {}
+
         # Load tree from session if available
         if self.session_path and os.path.exists(self.session_path):
             self._load_tree()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the underlying HTTP sessions and worker threads, releasing their pooled connections.
+        """
+        self._executor.shutdown()
+        self._download_executor.shutdown()
+        self._session.close()
+        self._probe_session.close()
+
     def wait_device_connection(self, delay: int = 1):
         """
         Blocks execution until the reMarkable tablet is detected as connected.
 
+        Checks start 0.1 seconds apart and back off exponentially up to the given delay, so a tablet plugged in shortly
+        after the call is noticed quickly without polling at a high rate for long waits.
+
         Args:
-            delay (int): Delay in seconds between each connection check (default: 1 second).
+            delay (int): Maximum delay in seconds between each connection check (default: 1 second).
         """
+        current_delay = min(delay, 0.1)
         while not self.is_device_connected():
-            time.sleep(delay)
+            time.sleep(current_delay)
+            current_delay = min(current_delay * 1.5, delay)
 
     def is_device_connected(self) -> bool:
         """
-        Checks if the reMarkable tablet is connected by sending a request to the base URL.
+        Checks if the reMarkable tablet is connected by sending a HEAD request to the base URL.
+
+        Only the headers are transferred. The request is not retried, so an unplugged tablet costs a single timeout.
 
         Returns:
             True if the device is connected, False otherwise.
         """
         try:
-            requests.get(self.base_url, timeout=self.timeout)
-        except requests.ConnectTimeout:
+            self._probe_session.head(self.base_url, timeout=self.timeout)
+        except requests.ConnectionError:
             return False
         return True
 
@@ -71,48 +411,29 @@ class RemarkableAPI:
 
         If the request is successful, the local directory tree is updated to reflect the current state on the device.
         """
-        response = requests.post(f"{self.base_url}/documents/")
-        if response.status_code == 200:
-            root_dir = []
-            for item in response.json():
-                match item["Type"]:
-                    case "CollectionType":
-                        root_dir.append(Directory(
-                            guid=item["ID"],
-                            name=item["VissibleName"].encode("latin1").decode("utf-8"),
-                            last_change=datetime.strptime(item["ModifiedClient"], "%Y-%m-%dT%H:%M:%S.%fZ"),
-                            bookmarked=item["Bookmarked"],
-                            children=self._get_directory(item["ID"], item["Bookmarked"])
-                        ))
-                    case "DocumentType":
-                        root_dir.append(File(
-                            guid=item["ID"],
-                            name=item["VissibleName"].encode("latin1").decode("utf-8"),
-                            last_change=datetime.strptime(item["ModifiedClient"], "%Y-%m-%dT%H:%M:%S.%fZ"),
-                            bookmarked=item["Bookmarked"]
-                        ))
-            self.tree = root_dir
-        else:
-            self.tree = []
+        self.tree = self._get_directory("/")
 
     def _load_tree(self):
         """
         Loads the directory tree from the session file if it exists.
+
+        Uncompressed JSON sessions are still accepted. Session files that cannot be read as JSON (such as the pickle files
+        written by earlier versions) are ignored, leaving the tree empty so that the next download_changes treats every file as new.
         """
         if self.session_path and os.path.exists(self.session_path):
-            with open(self.session_path, "rb") as f:
-                self.tree = pickle.load(f)
+            self.tree = _read_session(self.session_path)
 
     def save_session(self):
         """
-        Saves the current directory tree to the session file.
+        Saves the current directory tree to the session file as zlib-compressed JSON.
         """
-        with open(self.session_path, "wb") as f:
-            pickle.dump(self.tree, f)
+        _write_session(self.session_path, self.tree)
 
     def _get_directory(self, dir_guid: str, dir_bookmarked: bool = False) -> List[Union[File, Directory]]:
         """
-        Retrieves the contents of a directory on the reMarkable tablet.
+        Retrieves the contents of a directory on the reMarkable tablet, including all of its subdirectories.
+
+        All listings are fetched first, then the tree is built from them in memory in a single pass.
 
         Args:
             dir_guid (str): The unique identifier (GUID) of the directory to retrieve.
@@ -121,29 +442,78 @@ class RemarkableAPI:
         Returns:
             List[Union[File, Directory]]: A list containing File and Directory objects representing the contents of the specified directory.
         """
-        response = requests.post(f"{self.base_url}/documents/{dir_guid if dir_guid != '/' else ''}")
+        return _build_tree(dir_guid, self._fetch_listings(dir_guid), dir_bookmarked)
+
+    def _fetch_listings(self, dir_guid: str) -> Dict[str, List[dict]]:
+        """
+        Fetches the raw listings of a directory and of all its subdirectories.
+
+        Requests run concurrently on the shared thread pool: as soon as a listing arrives, a request is submitted for
+        each of its subdirectories, without waiting for the rest of the tree level to complete.
+
+        Args:
+            dir_guid (str): The unique identifier (GUID) of the directory to retrieve.
+
+        Returns:
+            Dict[str, List[dict]]: The raw items of each directory, by directory GUID. Failed requests map to an empty list.
+        """
+        listings = {}
+        in_flight = {self._executor.submit(self._fetch_directory, dir_guid): dir_guid}
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                guid = in_flight.pop(future)
+                items = future.result()
+                listings[guid] = items if items is not None else []
+                for item in listings[guid]:
+                    if item["Type"] == "CollectionType":
+                        in_flight[self._executor.submit(self._fetch_directory, item["ID"])] = item["ID"]
+        return listings
+
+    def _fetch_directory(self, dir_guid: str) -> Union[List[dict], None]:
+        """
+        Requests the raw listing of a directory from the tablet, reusing a cached copy if it is recent enough.
+
+        Once the cached copy expires it is revalidated with If-Modified-Since when the tablet provided a Last-Modified
+        header, so an unchanged directory is answered with an empty 304 response instead of the whole listing.
+
+        Args:
+            dir_guid (str): The unique identifier (GUID) of the directory to retrieve.
+
+        Returns:
+            Union[List[dict], None]: The items returned by the tablet, or None if the request failed.
+        """
+        cached = self._dir_cache.get(dir_guid)
+        headers = {}
+        if cached is not None:
+            fetched_at, last_modified, items = cached
+            if time.monotonic() - fetched_at < self.cache_ttl:
+                return items
+            if last_modified is not None:
+                headers["If-Modified-Since"] = last_modified
+
+        response = self._session.post(f"{self.base_url}/documents/{dir_guid if dir_guid != '/' else ''}", headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self._dir_cache[dir_guid] = (time.monotonic(), cached[1], cached[2])
+            return cached[2]
         if response.status_code == 200:
-            root_dir = []
-            for item in response.json():
-                match item["Type"]:
-                    case "CollectionType":
-                        root_dir.append(Directory(
-                            guid=item["ID"],
-                            name=item["VissibleName"].encode("latin1").decode("utf-8"),
-                            last_change=datetime.strptime(item["ModifiedClient"], "%Y-%m-%dT%H:%M:%S.%fZ"),
-                            bookmarked=item["Bookmarked"],
-                            children=self._get_directory(item["ID"], dir_bookmarked or item["Bookmarked"])
-                        ))
-                    case "DocumentType":
-                        root_dir.append(File(
-                            guid=item["ID"],
-                            name=item["VissibleName"].encode("latin1").decode("utf-8"),
-                            last_change=datetime.strptime(item["ModifiedClient"], "%Y-%m-%dT%H:%M:%S.%fZ"),
-                            bookmarked=dir_bookmarked or item["Bookmarked"]
-                        ))
-            return root_dir
+            # The tablet sends UTF-8 without declaring a charset, so decode the raw bytes instead of response.json()
+            items = json.loads(response.content)
+            self._dir_cache[dir_guid] = (time.monotonic(), response.headers.get("Last-Modified"), items)
+            return items
+        return None
+
+    def invalidate_cache(self, guid: str = None):
+        """
+        Discards cached directory listings so that they are requested again from the tablet.
+
+        Args:
+            guid (str, optional): The GUID of the directory to invalidate. If None, the whole cache is cleared.
+        """
+        if guid is None:
+            self._dir_cache.clear()
         else:
-            return []
+            self._dir_cache.pop(guid, None)
 
     def download_file(self, file_guid: str, output_file: str) -> int:
         """
@@ -156,12 +526,32 @@ class RemarkableAPI:
         Returns:
             int: The HTTP status code of the download request (200 for success, error code otherwise).
         """
-        with requests.get(f"{self.base_url}/download/{file_guid}/placeholder", stream=True) as r:
+        return self._download_file(file_guid, output_file, create_dirs=True)
+
+    def _download_file(self, file_guid: str, output_file: str, create_dirs: bool) -> int:
+        """
+        Downloads a file from the reMarkable tablet and saves it to the specified path.
+
+        The file is streamed to a temporary ".part" file next to output_file, and only moved to output_file once
+        complete, so an existing copy is never replaced by a partial download.
+
+        Args:
+            file_guid (str): The unique identifier (GUID) of the file to be downloaded.
+            output_file (str): The path where the downloaded file will be saved.
+            create_dirs (bool): Whether the directory containing output_file may need to be created first.
+
+        Returns:
+            int: The HTTP status code of the download request (200 for success, error code otherwise).
+        """
+        with self._session.get(f"{self.base_url}/download/{file_guid}/placeholder", stream=True) as r:
             if r.status_code == 200:
-                # Ensure directory structure exists before saving the file
-                os.makedirs(os.path.dirname(output_file), exist_ok=True)
-                with open(output_file, "wb") as file:
-                    shutil.copyfileobj(r.raw, file)
+                if create_dirs:
+                    # Ensure directory structure exists before saving the file
+                    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+                with _part_file(output_file, file_guid, r.headers.get("Content-Length")) as file:
+                    # iter_content undoes any content encoding, large chunks keep the number of syscalls low
+                    for chunk in r.iter_content(chunk_size=1024 * 1024):
+                        file.write(chunk)
         return r.status_code
 
     def _print_directory(self, directory: Union[Directory, List[Union[File, Directory]]], indent_level: int = 0):
@@ -172,14 +562,22 @@ class RemarkableAPI:
             directory (Union[Directory, List[Union[File, Directory]]]): The Directory object or list of File/Directory objects to print.
             indent_level (int): The current level of indentation for nested directories (default: 0).
         """
-        directory = [directory] if isinstance(directory, Directory) else directory
-        if isinstance(directory, list):
-            for item in directory:
-                if isinstance(item, File):
-                    print(f"{' ' * indent_level * 4}[F] {item.name}")
-                elif isinstance(item, Directory):
-                    print(f"[D] {item.name}")
-                    self._print_directory(item.children, indent_level + 1)
+        items = [directory] if isinstance(directory, Directory) else directory
+        # Indentation strings are built once per depth, and the whole listing is written with a single call
+        indents = [""]
+        lines = []
+        stack = [(item, indent_level) for item in reversed(items)]
+        while stack:
+            item, level = stack.pop()
+            while len(indents) <= level:
+                indents.append(" " * len(indents) * 4)
+            if isinstance(item, File):
+                lines.append(f"{indents[level]}[F] {item.name}")
+            elif isinstance(item, Directory):
+                lines.append(f"{indents[level]}[D] {item.name}")
+                stack.extend((child, level + 1) for child in reversed(item.children))
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
     def download_tree(self, base_path: str = "", filter_fn: Callable[[Union[File, Directory]], bool] = None, downloaded_fn: Callable[[File, str], None] = None):
         """
@@ -190,52 +588,47 @@ class RemarkableAPI:
             base_path (str): The base local path where files and directories will be saved.
             filter_fn (Callable[[Union[File, Directory]], bool], optional): A function that takes a File or Directory object and returns True if the item should be downloaded, False otherwise.
             downloaded_fn (Callable[[File, str], None], optional): A callback function to execute after each file is downloaded. Receives the file downloaded and the path where it was saved.
+
+        Files are downloaded concurrently. downloaded_fn is called from the calling thread as each download completes.
+        The tablet allows files with the same name in one directory: only the last of them is downloaded, as it is the
+        one that would end up on disk anyway.
         """
-        for item in self.tree:
-            if isinstance(item, Directory):
-                dir_path = os.path.join(base_path, item.name)
-                if filter_fn is None or filter_fn(item):
-                    os.makedirs(os.path.dirname(dir_path), exist_ok=True)
-                    self._download_directory(item, dir_path, downloaded_fn=downloaded_fn)
-                else:
-                    self._download_directory(item, dir_path, filter_fn, downloaded_fn)
+        jobs, directories = _download_jobs(self.tree, base_path, filter_fn)
 
-            elif isinstance(item, File):
-                if filter_fn is None or filter_fn(item):
-                    file_path = os.path.join(base_path, f"{item.name}.pdf")
-                    self.download_file(item.guid, file_path)
-                    if downloaded_fn:
-                        downloaded_fn(item, file_path)
+        # Create every directory up front so that the download workers never have to. Going deepest first,
+        # each makedirs call also creates the ancestors, which are then skipped
+        self._mkdir_cache.clear()
+        for directory in sorted(directories, key=len, reverse=True):
+            self._ensure_dir(directory)
 
-    def _download_directory(self, directory: Directory, base_path: str, filter_fn: Callable[[Union[File, Directory]], bool] = None, downloaded_fn: Callable[[File, str], None] = None):
+        futures = {self._download_executor.submit(self._download_file, item.guid, item_path, False): (item, item_path) for item_path, item in jobs.items()}
+        try:
+            for future in as_completed(futures):
+                future.result()
+                if downloaded_fn:
+                    downloaded_fn(*futures[future])
+        except BaseException:
+            # Do not start the downloads still queued once one has failed
+            for future in futures:
+                future.cancel()
+            raise
+
+    def _ensure_dir(self, path: str):
         """
-        Recursively downloads the contents of a directory.
+        Creates a directory and its missing parents, unless it was already created since the cache was last cleared.
 
         Args:
-            directory (Directory): The Directory object to download.
-            base_path (str): The base local path where files and directories will be saved.
-            filter_fn (Callable[[Union[File, Directory]], bool], optional): A function that takes a File or Directory object and returns True if the item should be downloaded.
-            downloaded_fn (Callable[[File, str], None], optional): A callback function to execute after each file is downloaded. Receives the file downloaded and the path where it was saved.
+            path (str): The directory to create. An empty path refers to the current directory and is skipped.
         """
-        for item in directory.children:
-            if isinstance(item, Directory):
-                dir_path = os.path.join(base_path, item.name)
-                if filter_fn is None or filter_fn(item):
-                    os.makedirs(os.path.dirname(dir_path), exist_ok=True)
-                    self._download_directory(item, dir_path, downloaded_fn=downloaded_fn)
-                else:
-                    self._download_directory(item, dir_path, filter_fn, downloaded_fn)
-
-            elif isinstance(item, File):
-                if filter_fn is None or filter_fn(item):
-                    file_path = os.path.join(base_path, f"{item.name}.pdf")
-                    self.download_file(item.guid, file_path)
-                    if downloaded_fn:
-                        downloaded_fn(item, file_path)
+        if path and path not in self._mkdir_cache:
+            os.makedirs(path, exist_ok=True)
+            while path and path not in self._mkdir_cache:
+                self._mkdir_cache.add(path)
+                path = os.path.dirname(path)
 
     def _find_item_in_tree(self, target_item: Union[File, Directory], tree: List[Union[File, Directory]]) -> Union[File, Directory, None]:
         """
-        Recursively searches for an item in the given tree by GUID.
+        Searches for an item in the given tree by GUID, depth-first using an explicit stack.
 
         Args:
             target_item: The item to search for.
@@ -244,16 +637,16 @@ class RemarkableAPI:
         Returns:
             Union[File, Directory, None]: The matching File or Directory object if found, otherwise None.
         """
-        for item in tree:
+        stack = list(reversed(tree))
+        while stack:
+            item = stack.pop()
             if item.guid == target_item.guid:
                 return item
-            elif isinstance(item, Directory):
-                result = self._find_item_in_tree(target_item, item.children)
-                if result is not None:
-                    return result
+            if isinstance(item, Directory):
+                stack.extend(reversed(item.children))
         return None
 
-    def download_changes(self, base_path: str, filter_fn: Callable[[Union[File, Directory]], bool] = None, downloaded_fn: Callable[[File, str], None] = None):
+    def download_changes(self, base_path: str, filter_fn: Callable[[Union[File, Directory]], bool] = None, downloaded_fn: Callable[[File, str], None] = None, skip_unchanged_directories: bool = False):
         """
         Downloads only the files that have changed since the last sync.
 
@@ -261,57 +654,11 @@ class RemarkableAPI:
             base_path (str): The base local path where modified files will be saved.
             filter_fn (Callable[[Union[File, Directory]], bool], optional): A filter function to apply during download.
             downloaded_fn (Callable[[File, str], None], optional): A callback function to execute after each file is downloaded. Receives the file downloaded and the path where it was saved.
+            skip_unchanged_directories (bool): If True, directories whose last change is the same as in the last sync are not compared at all.
+                Only enable this if the tablet updates a directory's timestamp whenever its contents change, otherwise changes inside it are missed.
         """
-        old_tree = self.tree
+        old_index = _flatten_tree(self.tree)
         self.sync_file_system()
-        modified_files = []
-        self._get_modified_file_guids(old_tree, self.tree, modified_files)
-        self.download_tree(base_path=base_path, filter_fn=(lambda item: item.guid in modified_files) if filter_fn is None else (lambda item: item.guid in modified_files and filter_fn(item)), downloaded_fn=downloaded_fn)
-
-    def _get_modified_file_guids(self, old_tree: List[Union[File, Directory]], new_tree: List[Union[File, Directory]], modified_files: List[File]):
-        """
-        Recursively compares two directory trees to find the files that have been modified or added.
-
-        Args:
-            old_tree (List[Union[File, Directory]]): The previously saved directory tree.
-            new_tree (List[Union[File, Directory]]): The current directory tree fetched from the tablet.
-            modified_files (List[File]): A list to append files that have been modified or added.
-        """
-        for new_item in new_tree:
-            matching_old_item = self._find_item_in_tree_path(new_item.name, old_tree)
-
-            if isinstance(new_item, File):
-                if matching_old_item is None or new_item.last_change > matching_old_item.last_change:
-                    modified_files.append(new_item.guid)
-            elif isinstance(new_item, Directory):
-                # If it's a directory, recursively compare children
-                # TODO only if last change changed
-                if matching_old_item is not None and isinstance(matching_old_item, Directory):
-                    self._get_modified_file_guids(matching_old_item.children, new_item.children, modified_files)
-                # If the directory is new, add all files to list
-                else:
-                    self._get_modified_file_guids([], new_item.children, modified_files)
-
-    def _find_item_in_tree_path(self, target_path: str, tree: List[Union[File, Directory]], current_path: str = "") -> Union[File, Directory, None]:
-        """
-        Recursively searches for an item in the given tree by path.
-
-        Args:
-            target_path (str): The path of the item to search for.
-            tree (List[Union[File, Directory]]): The list of File or Directory objects representing the tree.
-            current_path (str): The current path being traversed in the tree (default: empty string).
-
-        Returns:
-            Union[File, Directory, None]: The matching File or Directory object if found, otherwise None.
-        """
-        for item in tree:
-            item_path = f"{current_path}/{item.name}".strip("/")
-            if item_path == target_path:
-                return item
-            elif isinstance(item, Directory):
-                result = self._find_item_in_tree_path(target_path, item.children, item_path)
-                if result is not None:
-                    return result
-        return None
-
-
+        modified_files = set()
+        _get_modified_file_guids(old_index, self.tree, modified_files, skip_unchanged_directories)
+        self.download_tree(base_path=base_path, filter_fn=_changed_files_filter(modified_files, filter_fn), downloaded_fn=downloaded_fn)
@@ -0,0 +1,212 @@
+import os
+import json
+import asyncio
+from .api import _build_tree, _changed_files_filter, _download_jobs, _flatten_tree, _get_modified_file_guids, _part_file, _read_session, _write_session
+from .models import File, Directory
+from typing import Dict, List, Union, Callable
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncRemarkableAPI:
+    """
+    An asyncio counterpart of RemarkableAPI, built on httpx.AsyncClient.
+
+    Directory listings and downloads are all issued concurrently from a single thread over one pooled client, instead of
+    being spread across worker threads. Sessions use the same file format as RemarkableAPI and can be shared with it.
+
+    Requires the optional httpx dependency (pip install remarkable_offline_api[async]).
+
+    Attributes:
+        session_path (str): Path to the session file for saving/restoring the file tree.
+        base_url (str): The base URL of the reMarkable tablet's local API.
+        timeout (int): Timeout duration for checking device connectivity.
+        tree (List[Union[File, Directory]]): The current representation of the file system.
+    """
+
+    def __init__(self, session_name: str = None, base_url: str = "http://10.11.99.1", timeout: int = 1, max_downloads: int = 4):
+        """
+        Initializes the AsyncRemarkableAPI class with basic configurations.
+
+        Args:
+            session_name: The name of the session file to load/save.
+            base_url: The base URL of the reMarkable tablet's local API.
+            timeout: The timeout duration for checking device connectivity.
+            max_downloads: The maximum number of files downloaded at the same time.
+        """
+        if httpx is None:
+            raise ImportError("AsyncRemarkableAPI requires httpx, install it with: pip install remarkable_offline_api[async]")
+
+        self.session_path = f"{session_name}.session"
+        self.base_url = base_url
+        self.timeout = timeout
+        self.tree: List[Union[File, Directory]] = []
+
+        # Same connection settings as RemarkableAPI: keep-alive, no compression over the USB link, retry connection errors.
+        # The limits must be given to the transport, the client ignores its own when a transport is passed. Like
+        # RemarkableAPI, requests have no timeout, since the tablet can take a while to render a large PDF
+        self._client = httpx.AsyncClient(
+            headers={"Accept-Encoding": "identity"},
+            timeout=None,
+            transport=httpx.AsyncHTTPTransport(retries=2, limits=httpx.Limits(max_connections=8, max_keepalive_connections=8))
+        )
+        # As with RemarkableAPI's probe session, connectivity checks are not retried
+        self._probe_client = httpx.AsyncClient()
+        self._download_semaphore = asyncio.Semaphore(max_downloads)
+
+        # Load tree from session if available
+        if self.session_path and os.path.exists(self.session_path):
+            self.tree = _read_session(self.session_path)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Closes the underlying HTTP clients and their pooled connections.
+        """
+        await self._client.aclose()
+        await self._probe_client.aclose()
+
+    async def wait_device_connection(self, delay: int = 1):
+        """
+        Waits until the reMarkable tablet is detected as connected, backing off exponentially up to the given delay.
+
+        Args:
+            delay (int): Maximum delay in seconds between each connection check (default: 1 second).
+        """
+        current_delay = min(delay, 0.1)
+        while not await self.is_device_connected():
+            await asyncio.sleep(current_delay)
+            current_delay = min(current_delay * 1.5, delay)
+
+    async def is_device_connected(self) -> bool:
+        """
+        Checks if the reMarkable tablet is connected by sending a HEAD request to the base URL.
+
+        Returns:
+            True if the device is connected, False otherwise.
+        """
+        try:
+            await self._probe_client.head(self.base_url, timeout=self.timeout)
+        except httpx.TransportError:
+            return False
+        return True
+
+    async def sync_file_system(self):
+        """
+        Fetches the current file system structure from the tablet and updates the local representation.
+        """
+        self.tree = await self._get_directory("/")
+
+    def save_session(self):
+        """
+        Saves the current directory tree to the session file as zlib-compressed JSON.
+        """
+        _write_session(self.session_path, self.tree)
+
+    async def _get_directory(self, dir_guid: str, dir_bookmarked: bool = False) -> List[Union[File, Directory]]:
+        """
+        Retrieves the contents of a directory on the reMarkable tablet, including all of its subdirectories.
+
+        Args:
+            dir_guid (str): The unique identifier (GUID) of the directory to retrieve.
+            dir_bookmarked (bool): If True, the directory and all its contents are considered bookmarked.
+
+        Returns:
+            List[Union[File, Directory]]: A list containing File and Directory objects representing the contents of the specified directory.
+        """
+        return _build_tree(dir_guid, await self._fetch_listings(dir_guid), dir_bookmarked)
+
+    async def _fetch_listings(self, dir_guid: str) -> Dict[str, List[dict]]:
+        """
+        Fetches the raw listings of a directory and of all its subdirectories, requesting every subdirectory as soon as its parent listing arrives.
+
+        Args:
+            dir_guid (str): The unique identifier (GUID) of the directory to retrieve.
+
+        Returns:
+            Dict[str, List[dict]]: The raw items of each directory, by directory GUID. Failed requests map to an empty list.
+        """
+        listings = {}
+
+        async def fetch(guid: str):
+            response = await self._client.post(f"{self.base_url}/documents/{guid if guid != '/' else ''}")
+            listings[guid] = json.loads(response.content) if response.status_code == 200 else []
+            await asyncio.gather(*(fetch(item["ID"]) for item in listings[guid] if item["Type"] == "CollectionType"))
+
+        await fetch(dir_guid)
+        return listings
+
+    async def download_file(self, file_guid: str, output_file: str) -> int:
+        """
+        Downloads a file from the reMarkable tablet and saves it to the specified path.
+
+        Args:
+            file_guid (str): The unique identifier (GUID) of the file to be downloaded.
+            output_file (str): The path where the downloaded file will be saved.
+
+        Returns:
+            int: The HTTP status code of the download request (200 for success, error code otherwise).
+        """
+        async with self._download_semaphore:
+            async with self._client.stream("GET", f"{self.base_url}/download/{file_guid}/placeholder") as r:
+                if r.status_code == 200:
+                    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+                    with _part_file(output_file, file_guid, r.headers.get("Content-Length")) as file:
+                        async for chunk in r.aiter_bytes(1024 * 1024):
+                            file.write(chunk)
+            return r.status_code
+
+    async def download_tree(self, base_path: str = "", filter_fn: Callable[[Union[File, Directory]], bool] = None, downloaded_fn: Callable[[File, str], None] = None):
+        """
+        Downloads all files and directories from the current tree to the specified base path.
+        Optionally applies a filter function to determine which files to download.
+
+        Args:
+            base_path (str): The base local path where files and directories will be saved.
+            filter_fn (Callable[[Union[File, Directory]], bool], optional): A function that takes a File or Directory object and returns True if the item should be downloaded, False otherwise.
+            downloaded_fn (Callable[[File, str], None], optional): A callback function to execute after each file is downloaded. Receives the file downloaded and the path where it was saved.
+
+        Files are downloaded concurrently, up to max_downloads at a time. downloaded_fn is called as each download completes.
+        Of several files with the same name in one directory, only the last is downloaded.
+        """
+        jobs, directories = _download_jobs(self.tree, base_path, filter_fn)
+        for directory in directories:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        async def download(item: File, item_path: str):
+            await self.download_file(item.guid, item_path)
+            return item, item_path
+
+        tasks = [asyncio.ensure_future(download(item, item_path)) for item_path, item in jobs.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item, item_path = await next_done
+                if downloaded_fn:
+                    downloaded_fn(item, item_path)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def download_changes(self, base_path: str, filter_fn: Callable[[Union[File, Directory]], bool] = None, downloaded_fn: Callable[[File, str], None] = None, skip_unchanged_directories: bool = False):
+        """
+        Downloads only the files that have changed since the last sync, like RemarkableAPI.download_changes.
+
+        Args:
+            base_path (str): The base local path where modified files will be saved.
+            filter_fn, downloaded_fn, skip_unchanged_directories: As for RemarkableAPI.download_changes.
+        """
+        old_index = _flatten_tree(self.tree)
+        await self.sync_file_system()
+        modified_files = set()
+        _get_modified_file_guids(old_index, self.tree, modified_files, skip_unchanged_directories)
+        await self.download_tree(base_path=base_path, filter_fn=_changed_files_filter(modified_files, filter_fn), downloaded_fn=downloaded_fn)
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import List, Union
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class File:
     """
     Represents a file on the reMarkable tablet.
@@ -20,8 +20,40 @@ class File:
     last_change: datetime
     bookmarked: bool = False
 
+    def to_dict(self) -> dict:
+        """
+        Converts the file into a JSON-serializable dictionary.
 
-@dataclass
+        Returns:
+            dict: The file's fields, with last_change as an ISO 8601 string.
+        """
+        return {
+            "guid": self.guid,
+            "name": self.name,
+            "last_change": self.last_change.isoformat(),
+            "bookmarked": self.bookmarked
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "File":
+        """
+        Creates a file from a dictionary produced by to_dict.
+
+        Args:
+            data (dict): The dictionary to convert.
+
+        Returns:
+            File: The corresponding File object.
+        """
+        return cls(
+            guid=data["guid"],
+            name=data["name"],
+            last_change=datetime.fromisoformat(data["last_change"]),
+            bookmarked=data["bookmarked"]
+        )
+
+
+@dataclass(slots=True, frozen=True)
 class Directory:
     """
     Represents a directory on the reMarkable tablet, which may contain both files and subdirectories.
@@ -38,4 +70,51 @@ class Directory:
     name: str
     last_change: datetime
     children: List[Union["File", "Directory"]]
-    bookmarked: bool = False
\ No newline at end of file
+    bookmarked: bool = False
+
+    def to_dict(self) -> dict:
+        """
+        Converts the directory and all of its contents into a JSON-serializable dictionary.
+
+        Returns:
+            dict: The directory's fields, with last_change as an ISO 8601 string and children converted recursively.
+        """
+        return {
+            "guid": self.guid,
+            "name": self.name,
+            "last_change": self.last_change.isoformat(),
+            "bookmarked": self.bookmarked,
+            "children": [child.to_dict() for child in self.children]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Directory":
+        """
+        Creates a directory, including all of its contents, from a dictionary produced by to_dict.
+
+        Args:
+            data (dict): The dictionary to convert.
+
+        Returns:
+            Directory: The corresponding Directory object.
+        """
+        return cls(
+            guid=data["guid"],
+            name=data["name"],
+            last_change=datetime.fromisoformat(data["last_change"]),
+            bookmarked=data["bookmarked"],
+            children=[item_from_dict(child) for child in data["children"]]
+        )
+
+
+def item_from_dict(data: dict) -> Union[File, Directory]:
+    """
+    Creates a File or Directory from a dictionary produced by their to_dict method.
+
+    Args:
+        data (dict): The dictionary to convert. Dictionaries with children are treated as directories.
+
+    Returns:
+        Union[File, Directory]: The corresponding File or Directory object.
+    """
+    return Directory.from_dict(data) if "children" in data else File.from_dict(data)
@@ -1,12 +1,17 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="remarkable_offline_api",
     version="1.0.0",
-    packages=find_packages(),
+    # The repository root is the package itself, so it has to be declared explicitly
+    packages=["remarkable_offline_api"],
+    package_dir={"remarkable_offline_api": "."},
     install_requires=[
         "requests",
     ],
+    extras_require={
+        "async": ["httpx"],
+    },
     author="Luca Binotti",
     description="An offline API for managing and downloading files directly from the reMarkable tablet.",
     url="https://github.com/lucabinotti/ReMarkableOfflineAPI",